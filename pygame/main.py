@@ -1,9 +1,8 @@
-import copy
-import dataclasses
+import functools
 import logging
 
 import random
-from typing import Tuple, List
+from typing import Tuple, List, Sequence
 
 import pygame
 from pygame import Surface
@@ -16,37 +15,66 @@ pygame.init()
 MAX_SPEED = 13
 GAME_SPEED = 2
 CAR_SPEED = 5
+FPS = 60
 
+BlitArgs = List[Tuple[Surface, Tuple[int, int]]]
 
-@dataclasses.dataclass
-class Rect:
-    x1: int
-    x2: int
-    y1: int
-    y2: int
+
+@functools.lru_cache(maxsize=None)
+def _load_image(path: str) -> Surface:
+    # convert_alpha needs the display mode to be set, so images are loaded on first use
+    return pygame.image.load(path).convert_alpha()
+
+
+@functools.lru_cache(maxsize=None)
+def _load_font(path: str, size: int) -> pygame.font.Font:
+    return pygame.font.Font(path, size)
 
 
 class Element:
-    x = 0
-    y = 0
     respect_borders = False
+    step_bias = 0
     image_path: str
     show_explosion = False
 
     def __init__(self, screen: Surface):
-        self.image = pygame.image.load(self.image_path)
+        self._image_path = self.pick_image_path()
+        self.image = _load_image(self._image_path)
+        self.width = self.image.get_width()
+        self.height = self.image.get_height()
+        self.rect = pygame.Rect(0, 0, self.width, self.height)
         self.screen = screen
+        self.screen_width = screen.get_width()
+        self.screen_height = screen.get_height()
+
+    @classmethod
+    def pick_image_path(cls) -> str:
+        return cls.image_path
+
+    @property
+    def x(self) -> int:
+        return self.rect.x
+
+    @x.setter
+    def x(self, value: int) -> None:
+        self.rect.x = value
+
+    @property
+    def y(self) -> int:
+        return self.rect.y
+
+    @y.setter
+    def y(self, value: int) -> None:
+        self.rect.y = value
 
     def center_horizontally(self):
-        self.x = int(self.screen.get_width() / 2 - self.width / 2)
+        self.x = int(self.screen_width / 2 - self.width / 2)
 
     def set_position(self, x: int, y: int) -> None:
         self.x = x
         self.y = y
 
-    def move(self, step: int):
-        keys = pygame.key.get_pressed()
-
+    def move(self, step: int, keys: Sequence[bool]):
         if keys[pygame.K_UP]:
             self.move_up(step)
         if keys[pygame.K_DOWN]:
@@ -57,61 +85,57 @@ class Element:
             self.move_right(step)
 
     def move_up(self, step: int) -> None:
-        y = self.y - step
+        y = self.rect.y - step
         if self.respect_borders:
             y = max(0, y)
-        self.y = y
+        self.rect.y = y
 
     def move_down(self, step: int) -> None:
-        y = self.y + step
+        y = self.rect.y + step
         if self.respect_borders:
-            y = min(self.screen.get_height() - self.height, y)
-        self.y = y
+            y = min(self.screen_height - self.height, y)
+        self.rect.y = y
 
     def move_left(self, step: int) -> None:
-        x = self.x - step
+        x = self.rect.x - step
         if self.respect_borders:
             x = max(0, x)
-        self.x = x
+        self.rect.x = x
 
     def move_right(self, step: int) -> None:
-        x = self.x + step
+        x = self.rect.x + step
         if self.respect_borders:
-            x = min(self.screen.get_width() - self.width, x)
-        self.x = x
+            x = min(self.screen_width - self.width, x)
+        self.rect.x = x
 
-    def draw(self):
-        explosion_image = pygame.image.load("images/explosion.gif")
-        if self.exploded():
-            self.screen.blit(explosion_image, (self.x - 60, self.y))
-        else:
-            self.screen.blit(self.image, (self.x, self.y))
+    def update(self) -> None:
+        pass
 
-    @property
-    def size(self) -> Tuple[int, int]:
-        return self.image.get_width(), self.image.get_height()
+    def blit_args(self) -> BlitArgs:
+        if self.exploded():
+            return [(self.explosion_image, (self.rect.x - 60, self.rect.y))]
+        return [(self.image, self.rect)]
 
-    @property
-    def width(self) -> int:
-        return self.size[0]
+    def draw(self):
+        self.update()
+        self.screen.blits(self.blit_args(), doreturn=False)
 
     @property
-    def height(self) -> int:
-        return self.size[1]
+    def size(self) -> Tuple[int, int]:
+        return self.width, self.height
 
     def overlaps_with(self, element: "Element") -> bool:
-        element_1_x_position = self.x, self.x + self.width
-        element_1_y_position = self.y, self.y + self.height
-        element_2_x_position = element.x, element.x + element.width
-        element_2_y_position = element.y, element.y + element.height
+        return self.rect.colliderect(element.rect)
 
-        x_overlaps = set(range(*element_1_x_position)) & set(range(*element_2_x_position))
-        y_overlaps = set(range(*element_1_y_position)) & set(range(*element_2_y_position))
+    @property
+    def explosion_image(self) -> Surface:
+        return _load_image("images/explosion.gif")
 
-        return x_overlaps and y_overlaps
+    def overlapping(self, elements: List["Element"]) -> List["Element"]:
+        return [elements[i] for i in self.rect.collidelistall([element.rect for element in elements])]
 
     def has_left_screen(self) -> bool:
-        return self.y - self.height <= 0
+        return self.rect.y - self.height <= 0
 
     def exploded(self) -> bool:
         return self.show_explosion
@@ -143,33 +167,36 @@ class Car(Element):
 
     def __init__(self, **kwargs):
         super(Car, self).__init__(**kwargs)
-        self.image = pygame.image.load(self.image_path)
         self.init_car_position()
 
-        self.blast = pygame.image.load("images/rocket_blast.png")
+        self.blast = _load_image("images/rocket_blast.png")
 
-    @property
-    def image_path(self):
-        return random.choice(self.image_paths)
+    @classmethod
+    def pick_image_path(cls) -> str:
+        return random.choice(cls.image_paths)
 
-    def move(self, **kwargs):
-        super().move(step=self.speed)
+    def move(self, keys: Sequence[bool]):
+        super().move(step=self.speed, keys=keys)
 
     def init_car_position(self):
         self.center_horizontally()
-        self.move_down(self.screen.get_height() - self.height - 20)
+        self.move_down(self.screen_height - self.height - 20)
 
-    def draw(self):
-        super().draw()
+    def update(self) -> None:
+        for bullet in self.bullets:
+            bullet.update()
 
+    def blit_args(self) -> BlitArgs:
+        blit_args = super().blit_args()
         for bullet in self.bullets:
-            bullet.draw()
-            if bullet.has_left_screen():
-                self.bullets.remove(bullet)
-                del bullet
+            blit_args.extend(bullet.blit_args())
+        return blit_args
 
-    def fire_bullet(self) -> None:
-        keys = pygame.key.get_pressed()
+    def draw(self):
+        super().draw()
+        self.bullets = [bullet for bullet in self.bullets if not bullet.has_left_screen()]
+
+    def fire_bullet(self, keys: Sequence[bool]) -> None:
         if keys[pygame.K_SPACE] and not self.exploded():
             if self.fire_count % self.fire_rate == 0:
                 self.bullets.append(Bullet(screen=self.screen, car=self))
@@ -179,9 +206,13 @@ class Car(Element):
             self.fire_count = 0
 
     def bullets_hit_opponent(self, game: "Game", opponents: List["OtherCar"]):
+        live_opponents = [opponent for opponent in opponents if not opponent.exploded()]
+        if not live_opponents:
+            return
+
         for bullet in self.bullets:
-            for opponent in opponents:
-                if bullet.overlaps_with(opponent) and not opponent.exploded():
+            for opponent in bullet.overlapping(live_opponents):
+                if not opponent.exploded():
                     opponent.explode()
                     game.score += 2
 
@@ -189,19 +220,24 @@ class Car(Element):
 class Road(Element):
     image_path = "images/road.png"
     respect_borders = False
+    tile_spacing = 400
 
     def __init__(self, **kwargs):
         super(Road, self).__init__(**kwargs)
         self.center_horizontally()
 
-    def draw(self):
-        self.screen.blit(self.image, (self.x, self.y - 800))
-        self.screen.blit(self.image, (self.x, self.y - 400))
-        self.screen.blit(self.image, (self.x, self.y))
-        self.screen.blit(self.image, (self.x, self.y + 400))
-
-        if self.y >= self.screen.get_height():
-            self.y = 0
+    def update(self) -> None:
+        if self.rect.y >= self.screen_height:
+            self.rect.y = 0
+
+    def blit_args(self) -> BlitArgs:
+        x = self.rect.x
+        y = self.rect.y % self.tile_spacing
+        return [
+            (self.image, (x, tile_y))
+            for tile_y in range(y - 2 * self.tile_spacing, self.screen_height, self.tile_spacing)
+            if tile_y + self.height > 0
+        ]
 
 
 class Obstacle(Element):
@@ -211,24 +247,26 @@ class Obstacle(Element):
 
     def __init__(self, **kwargs):
         super(Obstacle, self).__init__(**kwargs)
-        self.y = self.get_random_y_position()
-        self.x = self.get_random_x_position()
+        self._x_range = self.screen_width - self.width
+        self._y_range = self.screen_height - self.height
+        self.respawn()
 
     def get_random_x_position(self) -> int:
-        return random.randrange(0, self.screen.get_width() - self.width)
+        return int(random.random() * self._x_range)
 
     def get_random_y_position(self) -> int:
-        return random.randrange(-1 * self.screen.get_height(), -1 * self.height)
+        return int(random.random() * self._y_range) - self.screen_height
 
-    @property
-    def image_path(self):
-        return random.choice(self.obstacle_images)
+    def respawn(self) -> None:
+        self.rect.topleft = self.get_random_x_position(), self.get_random_y_position()
 
-    def draw(self):
-        if self.y >= self.screen.get_height():
-            self.y = self.get_random_y_position()
-            self.x = self.get_random_x_position()
-        super().draw()
+    @classmethod
+    def pick_image_path(cls) -> str:
+        return random.choice(cls.obstacle_images)
+
+    def update(self) -> None:
+        if self.rect.y >= self.screen_height:
+            self.respawn()
 
 
 class OtherCar(Obstacle):
@@ -241,20 +279,18 @@ class OtherCar(Obstacle):
         "images/car2.png",
         "images/car3.png",
     ]
+    step_bias = -1
 
-    def move_down(self, step: int) -> None:
-        super().move_down(step=step - 1)
-
-    def draw(self):
-        if self.y >= self.screen.get_height():
+    def update(self) -> None:
+        if self.rect.y >= self.screen_height:
             self.unexplode()
-            self.y = self.get_random_y_position()
-            self.x = self.get_random_x_position()
-        super().draw()
+            self.respawn()
 
 
 class Bullet(Obstacle):
-    image_path = "images/bullet.png"
+    obstacle_images = [
+        "images/bullet.png",
+    ]
 
     def __init__(self, car: Car, **kwargs) -> None:
         super().__init__(**kwargs)
@@ -262,9 +298,11 @@ class Bullet(Obstacle):
         self.x = int(car.x + car.width / 2)
         self.y = car.y
 
-    def draw(self):
-        self.y -= self.car.speed + 5
-        self.screen.blit(self.image, (self.x, self.y - self.car.speed + 3))
+    def update(self) -> None:
+        self.rect.y -= self.car.speed + 5
+
+    def blit_args(self) -> BlitArgs:
+        return [(self.image, (self.rect.x, self.rect.y - self.car.speed + 3))]
 
 
 class Game:
@@ -278,6 +316,12 @@ class Game:
         self.window_width = window_width
         self.window_height = window_height
         self.static_objects = []
+        self._obstacles = []
+        self._opponents = []
+        self._font = _load_font("fonts/font.ttf", 32)
+        self._score_surface = None
+        self._score_cached = -1
+        self._clock = pygame.time.Clock()
 
         # setup window
         self.screen = pygame.display.set_mode((self.window_width, self.window_height))
@@ -286,7 +330,7 @@ class Game:
         self.car = Car(screen=self.screen)
 
         # init static objects
-        self.static_objects = [
+        for static_object in [
             Road(screen=self.screen),
             Obstacle(screen=self.screen),
             Obstacle(screen=self.screen),
@@ -295,30 +339,32 @@ class Game:
             OtherCar(screen=self.screen),
             # OtherCar(screen=self.screen),
             # OtherCar(screen=self.screen),
-        ]
+        ]:
+            self._add_static_object(static_object)
 
     def run(self):
         self.running = True
 
         while self.running:
             self._check_game_closed()
+            keys = pygame.key.get_pressed()
             self._draw_background()
 
             self._move_static_objects(step=self.game_speed)
             self._draw_statis_objects()
 
             if self.game_speed > 0:
-                self.car.move()
+                self.car.move(keys=keys)
 
             self.car.draw()
 
-            self.car.fire_bullet()
+            self.car.fire_bullet(keys)
             self.car.bullets_hit_opponent(self, self.opponents)
 
             self._draw_score()
             self._fuel_tank_collected()
 
-            if self._reset_pressed():
+            if self._reset_pressed(keys):
                 self.reset()
                 self.score = 0
 
@@ -327,6 +373,7 @@ class Game:
                 self.car.explode()
 
             pygame.display.flip()
+            self._clock.tick(FPS)
 
         pygame.quit()
 
@@ -339,66 +386,72 @@ class Game:
         self.car.show_explosion = False
         self.game_speed = GAME_SPEED
         self.car.init_car_position()
-        for obstacle in self.obstacles:
-            obstacle.x = obstacle.get_random_x_position()
-            obstacle.y = obstacle.get_random_y_position()
-        for opponent in self.opponents:
+        for obstacle in self._obstacles:
+            obstacle.respawn()
+        for opponent in self._opponents:
             opponent.unexplode()
 
     @property
     def obstacles(self) -> List[Obstacle]:
-        return [obj for obj in self.static_objects if type(obj) == Obstacle]
+        return self._obstacles
 
     @property
     def opponents(self) -> List[OtherCar]:
-        return [obj for obj in self.static_objects if type(obj) == OtherCar]
+        return self._opponents
+
+    def _add_static_object(self, static_object: Element) -> None:
+        self.static_objects.append(static_object)
+        if type(static_object) is Obstacle:
+            self._obstacles.append(static_object)
+        elif type(static_object) is OtherCar:
+            self._opponents.append(static_object)
 
     def _fuel_tank_collected(self) -> bool:
         collected = False
-        for obstacle in self.obstacles:
-            if self.car.overlaps_with(obstacle):
-                obstacle.x = obstacle.get_random_x_position()
-                obstacle.y = obstacle.get_random_y_position()
-                self.score += 1
-                collected = True
+        for obstacle in self.car.overlapping(self.obstacles):
+            obstacle.respawn()
+            self.score += 1
+            collected = True
 
-                if self.score % 10 == 0:
-                    self.game_speed += 1
+            if self.score % 10 == 0:
+                self.game_speed += 1
 
         return collected
 
     def _opponent_hit(self) -> bool:
-        non_exploded_opponents = [
-            o for o in self.opponents if not o.exploded()
-        ]
-        return any(
-            opponent for opponent in non_exploded_opponents if self.car.overlaps_with(opponent)
-        )
+        live_opponents = [opponent for opponent in self.opponents if not opponent.exploded()]
+        return bool(live_opponents and self.car.overlapping(live_opponents))
 
     @staticmethod
-    def _reset_pressed() -> bool:
-        return pygame.key.get_pressed()[pygame.K_r]
+    def _reset_pressed(keys: Sequence[bool]) -> bool:
+        return keys[pygame.K_r]
 
     def _move_static_objects(self, step: int) -> None:
+        # static objects never respect borders, so skip move_down and its clamping
         for static_object in self.static_objects:
-            static_object.move_down(step=step)
+            static_object.rect.y += step + static_object.step_bias
 
     def _draw_statis_objects(self) -> None:
+        blit_args = []
         for static_object in self.static_objects:
-            static_object.draw()
+            static_object.update()
+            blit_args.extend(static_object.blit_args())
+        self.screen.blits(blit_args, doreturn=False)
 
     def _check_game_closed(self):
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT or getattr(event, "key", None) == pygame.K_ESCAPE:
+        for event in pygame.event.get((pygame.QUIT, pygame.KEYDOWN)):
+            if event.type == pygame.QUIT or event.key == pygame.K_ESCAPE:
                 self.running = False
+        pygame.event.clear()
 
     def _draw_background(self):
         self.screen.fill((255, 255, 255))
 
     def _draw_score(self):
-        font = pygame.font.Font("fonts/font.ttf", 32)
-        score = font.render(f"SCORE: {str(self.score)}", False, (0, 0, 255))
-        self.screen.blit(score, (30, 0))
+        if self.score != self._score_cached:
+            self._score_surface = self._font.render(f"SCORE: {str(self.score)}", False, (0, 0, 255))
+            self._score_cached = self.score
+        self.screen.blit(self._score_surface, (30, 0))
 
     def _increase_speed(self) -> None:
         self.speed = min(MAX_SPEED, self.game_speed + 1)